@@ -1,18 +1,32 @@
 """Simple Voice AI Assistant - FastAPI backend for voice calls with Groq LLM"""
 
 import os
-import json
+import re
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
+from xml.sax.saxutils import escape
 
+import aiofiles
+import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import FastAPI, Form, Query, Request
-from fastapi.responses import Response, FileResponse
+from fastapi.responses import Response, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from groq import Groq
+from groq import AsyncGroq
 from gtts import gTTS
-from pydub import AudioSegment
 from twilio.twiml.voice_response import VoiceResponse, Gather
 from twilio.rest import Client as TwilioClient
 
@@ -22,9 +36,13 @@ load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_LLM_MODEL = os.getenv("GROQ_LLM_MODEL", "llama-3.3-70b-versatile")
-AUDIO_DIR = os.getenv("AUDIO_DIR", "audio_files")
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("PORT", "8000"))  # Default 8000 for local dev, 7860 for HF Spaces
+# Threads for blocking SDK work (gTTS, Twilio REST, embeddings) run via asyncio.to_thread
+THREAD_POOL_WORKERS = int(os.getenv("THREAD_POOL_WORKERS", "32"))
+# Pretty per-step console breakdown of every voice turn + console echo of JSON log events
+# (off by default - it's hot-path overhead)
+VERBOSE_VOICE_LOGS = os.getenv("VERBOSE_VOICE_LOGS", "0") == "1"
 
 # Twilio creds - can be set via UI or .env
 TWILIO_CREDENTIALS = {
@@ -34,10 +52,55 @@ TWILIO_CREDENTIALS = {
     "ui_set": False
 }
 
+# Keep this byte-identical across requests and never add per-call data to it:
+# Groq's prompt cache matches on the message prefix, so every prompt starts with it
 SYSTEM_PROMPT = "You are a helpful AI assistant. Keep responses concise."
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
 LLM_TEMPERATURE = 1
 LLM_MAX_TOKENS = 1024
-CONVERSATION_HISTORY_LIMIT = 10
+# Sampling settings shared by every completion call - only model/messages vary per request
+LLM_KWARGS = {"temperature": LLM_TEMPERATURE, "max_tokens": LLM_MAX_TOKENS}
+
+# Conversation memory - recent turns verbatim, older turns folded into a summary
+SUMMARY_LLM_MODEL = os.getenv("SUMMARY_LLM_MODEL", "llama-3.1-8b-instant")
+SUMMARY_PROMPT = (
+    "Summarize this conversation between a caller and an AI assistant in a few sentences. "
+    "Keep names, facts, decisions and open questions."
+)
+SUMMARY_MESSAGE = {"role": "system", "content": SUMMARY_PROMPT}
+CONVERSATION_TOKEN_LIMIT = 1500  # compact history once the prompt grows past this
+CONVERSATION_RECENT_TURNS = 2  # user/assistant exchanges kept verbatim after compaction
+CONVERSATION_MAX_RECENT_MESSAGES = 8  # hard FIFO window on verbatim messages, older ones are dropped
+CONVERSATION_MAX_CALLS = int(os.getenv("CONVERSATION_MAX_CALLS", "10000"))  # kept in memory at once (LRU beyond that)
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", "3600"))  # seconds a conversation is kept after its last turn
+CALL_ENDED_STATUSES = {"completed", "busy", "failed", "no-answer", "canceled"}
+TWILIO_VALIDATION_MAX_ENTRIES = 128
+TWILIO_VALIDATION_TTL = 600  # seconds a successful credential check is reused
+TWILIO_AUTH_ERROR_MARKERS = ("20003", "Authenticate", "Invalid")
+
+# Fixed prompts, synthesized once at startup and played instead of Twilio <Say>
+CANNED_PHRASES = {
+    "greet": "Hello! Please speak.",
+    "no_speech": "I didn't hear anything. Please speak again.",
+    "stt_failure": "I'm having trouble understanding. Please try again.",
+}
+AUDIO_STORE_MAX_CLIPS = 1000  # generated clips kept in memory for Twilio to fetch (LRU beyond that)
+AUDIO_STORE_TTL = 600  # seconds a clip stays fetchable after it was generated or last reused
+TTS_LANG = "en"
+TTS_CACHE_MAX_ENTRIES = 500  # synthesized phrases reused across calls ("Goodbye", short acknowledgments)
+TTS_CACHE_TTL = 3600  # seconds
+LLM_TIMEOUT = 30  # seconds
+LLM_TIMEOUT_MARKERS = ("timeout", "timed out", "connection")  # lowercased error text -> TimeoutError
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")  # where streamed LLM text is cut into TTS chunks
+
+# Semantic response cache - reuse answers for near-identical user turns
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MAX_ENTRIES = 10000
+
+# Exact-match LLM response cache - opt-in (temperature=1 makes answers vary), e.g. /api/chat?cache=1
+LLM_CACHE_MAX_ENTRIES = 1024
+LLM_CACHE_TTL = 300  # seconds
 
 # Enhanced logging configuration
 logging.basicConfig(
@@ -51,9 +114,6 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
-
 
 class JSONLogger:
     """
@@ -62,71 +122,285 @@ class JSONLogger:
     Purpose: Logs all events (calls, chat, errors) in structured JSON format
     Why: Makes it easy to analyze logs, track performance, debug issues
     Features:
-    - Saves to logs/app_logs.json
+    - Appends to logs/app_logs.jsonl (one JSON object per line, serialized with orjson)
+    - log_event only queues the entry; a background task writes batches to disk
+    - File is opened once (append mode) and kept open for the process lifetime
+    - Flushes every FLUSH_INTERVAL seconds or once FLUSH_BYTES are pending, fsyncs every FSYNC_INTERVAL
     - Tracks timestamps, durations, event types
-    - Persists across server restarts
-    - Structured data for easy parsing
+    - Persists across server restarts (append-only, never re-read)
+    - Structured data for easy parsing (read it line by line)
     """
     
-    def __init__(self, log_file="logs/app_logs.json"):
+    FLUSH_INTERVAL = 0.1  # seconds
+    FLUSH_BYTES = 64 * 1024
+    FSYNC_INTERVAL = 1.0  # seconds
+    
+    def __init__(self, log_file="logs/app_logs.jsonl"):
         self.log_file = Path(log_file)
+        self._pending = []
+        self._pending_bytes = 0
+        self._wakeup = None
+        self._drain_task = None
+        self._fp = None
+        self._last_fsync = 0.0
+    
+    async def start(self):
+        """Opens the log file and starts the background writer - call from the running event loop"""
         self.log_file.parent.mkdir(exist_ok=True)
-        self.logs = []
-        self.load_existing_logs()
-    
-    def load_existing_logs(self):
-        if self.log_file.exists():
+        self._fp = await aiofiles.open(self.log_file, "ab")
+        self._wakeup = asyncio.Event()
+        self._drain_task = asyncio.create_task(self._drain_loop())
+    
+    async def stop(self):
+        """Stops the background writer and flushes whatever is still pending"""
+        if self._drain_task:
+            self._drain_task.cancel()
             try:
-                with open(self.log_file, 'r') as f:
-                    self.logs = json.load(f)
-            except Exception:
-                self.logs = []
-    
-    def save_logs(self):
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+        if self._fp:
+            await self.flush(fsync=True)
+            await self._fp.close()
+            self._fp = None
+    
+    async def flush(self, fsync=False):
+        """Writes pending entries (no-op until start() opened the file); fsyncs at most every FSYNC_INTERVAL"""
+        if not self._pending or self._fp is None:
+            return
+        batch = b"\n".join(self._pending) + b"\n"
+        self._pending = []
+        self._pending_bytes = 0
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.logs, f, indent=2)
-            log.info(f"💾 JSON log saved: {len(self.logs)} entries")
+            await self._fp.write(batch)
+            await self._fp.flush()
+            if fsync or time.monotonic() - self._last_fsync >= self.FSYNC_INTERVAL:
+                await asyncio.to_thread(os.fsync, self._fp.fileno())
+                self._last_fsync = time.monotonic()
         except Exception as e:
             log.error(f"❌ Failed to save JSON logs: {e}")
             print(f"ERROR: Failed to save JSON logs: {e}")
     
+    async def _drain_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
     def log_event(self, event_type, call_sid=None, step=None, data=None, duration=None):
-        now = datetime.now()
+        # Single formatting pass - readers slice it: date = timestamp[:10], time = timestamp[11:23]
+        timestamp = datetime.now().isoformat(timespec="milliseconds")
         log_entry = {
-            "timestamp": now.isoformat(),
-            "date": now.strftime("%Y-%m-%d"),
-            "time": now.strftime("%H:%M:%S.%f")[:-3],  # Include milliseconds (3 digits)
+            "timestamp": timestamp,
             "event_type": event_type,
             "call_sid": call_sid,
             "step": step,
             "data": data or {},
             "duration_seconds": duration
         }
-        self.logs.append(log_entry)
+        line = orjson.dumps(log_entry, default=str)
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        if self._pending_bytes >= self.FLUSH_BYTES and self._wakeup:
+            self._wakeup.set()
         
-        # Print to terminal for immediate visibility
-        print(f"\n📋 JSON LOG [{log_entry['time']}] {event_type} | {step or 'N/A'}")
-        if call_sid:
-            print(f"   Call SID: {call_sid}")
-        if data:
-            print(f"   Data: {json.dumps(data, indent=2)}")
-        if duration is not None:
-            print(f"   Duration: {duration:.3f}s")
+        # Echo to terminal only when asked for - it re-serializes data and prints full transcripts
+        if VERBOSE_VOICE_LOGS:
+            print(f"\n📋 JSON LOG [{timestamp[11:23]}] {event_type} | {step or 'N/A'}")
+            if call_sid:
+                print(f"   Call SID: {call_sid}")
+            if data:
+                print(f"   Data: {orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2).decode()}")
+            if duration is not None:
+                print(f"   Duration: {duration:.3f}s")
         
-        self.save_logs()
         return log_entry
 
 
-# Setup
-os.makedirs("logs", exist_ok=True)
-os.makedirs(f"{AUDIO_DIR}/output", exist_ok=True)
+_embedding_models = {}  # model name -> fastembed TextEmbedding, shared by every SemanticCache
+_embedding_model_lock = threading.Lock()  # loads run in worker threads - build each model only once
+
+
+def load_embedding_model(model_name):
+    """Helper: Load (once per process) the fastembed model used by the semantic caches - blocking"""
+    with _embedding_model_lock:
+        model = _embedding_models.get(model_name)
+        if model is None:
+            # Imported lazily - loading the ONNX model is slow (downloaded on first run)
+            from fastembed import TextEmbedding
+            model = _embedding_models[model_name] = TextEmbedding(model_name=model_name)
+        return model
+
+
+class SemanticCache:
+    """
+    Semantic Cache - Reuses AI responses for semantically similar user turns
+    
+    Purpose: Skips the LLM (and TTS) round trip when a new utterance means the same as a cached one
+    Why: Groq + TTS cost 1s+ per turn; chit-chat voice traffic repeats itself a lot
+    Features:
+    - Embeds text with a small local model (fastembed, CPU only)
+    - Embeddings L2-normalized once and kept in one contiguous (N, D) float32 matrix,
+      so a lookup is a single matrix-vector product over all entries
+    - Hit when cosine similarity >= threshold
+    - LRU eviction once max_entries is reached (the evicted row is overwritten in place)
+    - Model is loaded by warm() at startup; until then every lookup is a miss, so a
+      webhook never waits for the download
+    - Disables itself if the embedding model can't be loaded
+    """
+    
+    def __init__(self, model_name=SEMANTIC_CACHE_MODEL, threshold=SEMANTIC_CACHE_THRESHOLD,
+                 max_entries=SEMANTIC_CACHE_MAX_ENTRIES):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.enabled = True
+        self._model = None
+        self._matrix = None  # (capacity, D) unit-norm rows, grown geometrically up to max_entries
+        self._size = 0  # rows in use
+        self._values = []  # row -> (response_text, sentences)
+        self._lru = OrderedDict()  # row -> None, least recently used first
+    
+    async def warm(self):
+        """Loads the embedding model off the event loop - run as a background task at startup"""
+        try:
+            self._model = await asyncio.to_thread(load_embedding_model, self.model_name)
+        except Exception as e:
+            log.error(f"❌ Semantic cache disabled, embedding model failed to load: {e}")
+            self.enabled = False
+    
+    def _embed_sync(self, text):
+        vector = np.asarray(next(iter(self._model.embed([text]))), dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+    
+    async def embed(self, text):
+        """Returns the unit-norm embedding for text, or None if the cache is disabled/not loaded yet"""
+        if not self.enabled or self._model is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._embed_sync, text)
+        except Exception as e:
+            log.error(f"❌ Semantic cache disabled, embedding failed: {e}")
+            self.enabled = False
+            return None
+    
+    def lookup(self, embedding):
+        """Returns {"response", "sentences", "similarity"} for the best match, or None on miss"""
+        if embedding is None or not self._size:
+            return None
+        # Rows and query are unit-norm, so the dot products are the cosine similarities
+        sims = self._matrix[:self._size] @ embedding
+        row = int(sims.argmax())
+        if sims[row] < self.threshold:
+            return None
+        self._lru.move_to_end(row)
+        response_text, sentences = self._values[row]
+        return {"response": response_text, "sentences": sentences, "similarity": float(sims[row])}
+    
+    def add(self, embedding, response_text, sentences=None):
+        if embedding is None:
+            return
+        if self._size < self.max_entries:
+            row = self._size
+            if self._matrix is None or row == len(self._matrix):
+                self._grow(len(embedding))
+            self._size += 1
+            self._values.append((response_text, sentences))
+        else:
+            row, _ = self._lru.popitem(last=False)
+            self._values[row] = (response_text, sentences)
+        self._matrix[row] = embedding
+        self._lru[row] = None
+    
+    def _grow(self, dim):
+        capacity = min(64 if self._matrix is None else len(self._matrix) * 2, self.max_entries)
+        matrix = np.empty((capacity, dim), dtype=np.float32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
 
-groq_client = Groq(api_key=GROQ_API_KEY)
+# Setup
+groq_client = None  # created by lifespan, see create_groq_client()
 json_logger = JSONLogger()
-conversations = {}  # per-call conversation history
+# Separate indexes: a chat message and a caller's utterance must never answer each other
+voice_semantic_cache = SemanticCache()
+chat_semantic_cache = SemanticCache()
+audio_store = TTLCache(maxsize=AUDIO_STORE_MAX_CLIPS, ttl=AUDIO_STORE_TTL)  # filename -> MP3 bytes of generated clips
+pinned_audio = {}  # filename -> MP3 bytes of canned prompts, never evicted
+tts_cache = TTLCache(maxsize=TTS_CACHE_MAX_ENTRIES, ttl=TTS_CACHE_TTL)  # blake2b(text|lang) -> MP3 bytes
+CANNED_AUDIO = {}  # CANNED_PHRASES key -> audio filename, filled by prepare_canned_audio()
+_canned_audio_task = None
+_semantic_cache_task = None
+llm_response_cache = TTLCache(maxsize=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL)  # prompt digest -> response
+# sha256 of [account_sid, auth_token, phone_number] -> account friendly name
+_twilio_validations = TTLCache(maxsize=TWILIO_VALIDATION_MAX_ENTRIES, ttl=TWILIO_VALIDATION_TTL)
+# Per-call conversation history: {"summary", "recent", "turns"}
+# Bounded + TTL so calls that never report a status callback don't leak memory
+conversations = TTLCache(maxsize=CONVERSATION_MAX_CALLS, ttl=CONVERSATION_TTL)
+_compaction_tasks = {}  # call_sid -> running summarization task
+_clip_tasks = {}  # audio filename -> synthesize_clip task still running, see start_clip()
+
+
+def create_groq_client():
+    """
+    Helper: Build the process-wide Groq client
+    
+    Why: One shared client per process - HTTP/2 keep-alive connections to Groq are reused
+    across requests instead of paying a TCP + TLS handshake per LLM call
+    Returns: AsyncGroq on a pooled httpx.AsyncClient (closed again when lifespan exits)
+    """
+    return AsyncGroq(
+        api_key=GROQ_API_KEY,
+        timeout=LLM_TIMEOUT,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    )
 
-app = FastAPI(title="Voice AI Assistant API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    App lifecycle: everything that needs the running event loop starts (and stops) here
+    
+    Startup: sizes the default executor, creates the Groq client, opens the JSON log,
+    kicks off canned-prompt synthesis and the semantic cache model load
+    Shutdown: cancels those startup tasks, closes the Groq client and flushes the JSON log
+    Note: The client is created here (not at import) so every lifespan gets an open one
+    """
+    global groq_client, _canned_audio_task, _semantic_cache_task
+    # Default executor is min(32, cpu + 4) threads - too few on a small Space when every
+    # call keeps several TTS threads busy, so size it explicitly
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREAD_POOL_WORKERS, thread_name_prefix="blocking-io")
+    )
+    groq_client = create_groq_client()
+    await json_logger.start()
+    # Runs in the background - prompts fall back to Twilio <Say> until their audio is ready
+    _canned_audio_task = asyncio.create_task(prepare_canned_audio())
+    # Same for the semantic caches - both share one model, which may be downloaded on first run
+    _semantic_cache_task = asyncio.gather(voice_semantic_cache.warm(), chat_semantic_cache.warm())
+    yield
+    for task in (_canned_audio_task, _semantic_cache_task):
+        task.cancel()
+    await asyncio.gather(_canned_audio_task, _semantic_cache_task, return_exceptions=True)
+    await groq_client.close()
+    await json_logger.stop()
+
+
+app = FastAPI(
+    title="Voice AI Assistant API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -137,7 +411,14 @@ app.add_middleware(
 )
 
 
-def get_llm_response(messages, model=GROQ_LLM_MODEL, timeout=30):
+def llm_cache_key(messages, model):
+    """Helper: llm_response_cache key - digest of the exact (model, messages) prompt"""
+    return hashlib.blake2b(
+        orjson.dumps([model, messages], option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).digest()
+
+
+async def get_llm_response(messages, model=GROQ_LLM_MODEL, call_sid=None):
     """
     Helper: Get AI response from Groq LLM
     
@@ -145,50 +426,357 @@ def get_llm_response(messages, model=GROQ_LLM_MODEL, timeout=30):
     Why: Reusable across voice and chat endpoints, consistent error handling
     Returns: AI-generated text response
     Raises: TimeoutError if request times out, Exception for other errors
+    Note: Uses the async client so the event loop keeps serving other webhooks while waiting
+    Caching: None here - _do_chat consults llm_response_cache itself (opt-in, ?cache=1)
     """
     try:
-        # Note: Groq SDK doesn't have built-in timeout, but we handle it at the exception level
-        completion = groq_client.chat.completions.create(
+        # Timeout is configured on the shared AsyncGroq client (LLM_TIMEOUT)
+        completion = await groq_client.chat.completions.create(
             model=model,
             messages=messages,
-            temperature=LLM_TEMPERATURE,
-            max_tokens=LLM_MAX_TOKENS
+            **LLM_KWARGS
         )
+        log_llm_usage(completion.usage, model, call_sid)
         return completion.choices[0].message.content.strip()
     except Exception as e:
-        error_str = str(e).lower()
-        # Check for timeout-related errors
-        if "timeout" in error_str or "timed out" in error_str or "connection" in error_str:
-            log.error(f"LLM Timeout Error: {str(e)}")
-            raise TimeoutError(f"LLM request timed out: {str(e)}")
-        log.error(f"LLM Error: {str(e)}")
-        raise
+        _raise_llm_error(e)
 
 
-def generate_tts_audio(text, call_sid):
+async def stream_llm_sentences(messages, model=GROQ_LLM_MODEL, call_sid=None):
     """
-    Helper: Generate TTS audio file
+    Helper: Stream AI response from Groq LLM one sentence at a time
     
-    Purpose: Converts text to speech audio file for voice responses
-    Why: Twilio needs WAV format, but gTTS creates MP3 - this handles conversion
-    Returns: (wav_path, mp3_path) or (None, None) on error
-    Process: Generate MP3 with gTTS -> Convert to WAV with pydub
+    Purpose: Same request as get_llm_response, but with stream=True
+    Why: Voice calls can start TTS on the first sentence while the rest is still being generated
+    Yields: Complete sentences (split on . ! ?), the trailing fragment is flushed at the end
+    Raises: TimeoutError if request times out, Exception for other errors
     """
     try:
-        tts = gTTS(text=text, lang="en", slow=False)
-        mp3_path = f"{AUDIO_DIR}/output/tts_{call_sid}_{os.urandom(4).hex()}.mp3"
-        os.makedirs(os.path.dirname(mp3_path), exist_ok=True)
-        tts.save(mp3_path)
-        
-        # Twilio needs WAV format
-        audio = AudioSegment.from_mp3(mp3_path)
-        wav_path = mp3_path.replace(".mp3", ".wav")
-        audio.export(wav_path, format="wav")
-        
-        return wav_path, mp3_path
+        stream = await groq_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            **LLM_KWARGS
+        )
+        buffer = ""
+        async for chunk in stream:
+            # Groq reports usage on the final chunk, under x_groq
+            usage = _usage_field(getattr(chunk, "x_groq", None), "usage")
+            if usage is not None:
+                log_llm_usage(usage, model, call_sid)
+            if not chunk.choices:
+                continue
+            buffer += chunk.choices[0].delta.content or ""
+            *sentences, buffer = SENTENCE_BOUNDARY.split(buffer)
+            for sentence in sentences:
+                if sentence.strip():
+                    yield sentence.strip()
+        if buffer.strip():
+            yield buffer.strip()
+    except Exception as e:
+        _raise_llm_error(e)
+
+
+def _usage_field(obj, name):
+    """Helper: Read a usage field whether the SDK typed it or left it a plain dict (extra fields)"""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def log_llm_usage(usage, model, call_sid=None):
+    """
+    Helper: Log token usage of one LLM call, including prompt-cache hits
+    
+    Purpose: Makes the Groq prompt cache hit rate observable in the JSON logs
+    Logs: prompt/completion tokens and cached_tokens (prompt tokens served from cache)
+    Note: groq==0.4.1 doesn't model x_groq / prompt_tokens_details, so those (and the streamed
+    usage itself) arrive as plain dicts - hence _usage_field instead of getattr
+    """
+    if usage is None:
+        return
+    prompt_tokens = _usage_field(usage, "prompt_tokens") or 0
+    details = _usage_field(usage, "prompt_tokens_details")
+    cached_tokens = _usage_field(details, "cached_tokens") if details else _usage_field(usage, "cached_tokens")
+    cached_tokens = cached_tokens or 0
+    json_logger.log_event(
+        event_type="llm",
+        call_sid=call_sid,
+        step="llm_usage",
+        data={
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": _usage_field(usage, "completion_tokens") or 0,
+            "cached_tokens": cached_tokens,
+            "cache_hit_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0
+        }
+    )
+
+
+def _raise_llm_error(e):
+    """Re-raises a Groq error, mapping timeout/connection failures to TimeoutError"""
+    error_str = str(e)
+    lowered = error_str.lower()
+    # Check for timeout-related errors
+    if any(marker in lowered for marker in LLM_TIMEOUT_MARKERS):
+        log.error(f"LLM Timeout Error: {error_str}")
+        raise TimeoutError(f"LLM request timed out: {error_str}") from e
+    log.error(f"LLM Error: {error_str}")
+    raise e
+
+
+def new_conversation():
+    """
+    Empty per-call conversation memory
+    
+    Invariant: the system prompt is never stored here. build_llm_messages always puts
+    SYSTEM_MESSAGE at index 0, so trimming or summarizing "recent" can't drop or reorder it
+    """
+    return {"summary": "", "recent": [], "turns": 0}
+
+
+def build_llm_messages(history, user_text):
+    """
+    Helper: Build the LLM prompt for one voice turn
+    
+    Order: system prompt -> conversation summary (if any) -> recent turns -> new user message
+    Why: Stable-first ordering keeps the longest possible prefix cacheable on Groq's side -
+    nothing dynamic (summary, timestamps, call data) may go before SYSTEM_MESSAGE
+    Note: At most CONVERSATION_MAX_RECENT_MESSAGES recent messages are sent, so per-turn
+    input stays bounded while a summary is still being computed
+    """
+    messages = [SYSTEM_MESSAGE]
+    if history["summary"]:
+        messages.append({"role": "system", "content": f"Summary of the conversation so far: {history['summary']}"})
+    return messages + history["recent"][-CONVERSATION_MAX_RECENT_MESSAGES:] + [{"role": "user", "content": user_text}]
+
+
+def estimate_tokens(messages):
+    """Rough token count (~4 characters per token) - only used to decide when to compact"""
+    return sum(len(m["content"]) for m in messages) // 4
+
+
+def schedule_conversation_compaction(call_sid):
+    """
+    Starts summarizing older turns in the background once the prompt exceeds CONVERSATION_TOKEN_LIMIT
+    
+    Note: Only the token limit triggers it - on ordinary short calls the hard
+    CONVERSATION_MAX_RECENT_MESSAGES window just drops the oldest messages (FIFO), so there is no
+    extra LLM call and the summary message (part of the cached prompt prefix) stays unchanged
+    """
+    history = conversations.get(call_sid)
+    if not history or call_sid in _compaction_tasks:
+        return
+    if estimate_tokens(build_llm_messages(history, "")) <= CONVERSATION_TOKEN_LIMIT:
+        return
+    task = asyncio.create_task(compact_conversation(call_sid))
+    _compaction_tasks[call_sid] = task
+    task.add_done_callback(lambda _: _compaction_tasks.pop(call_sid, None))
+
+
+async def compact_conversation(call_sid):
+    """
+    Helper: Fold older turns of a call into its running summary
+    
+    Purpose: Keeps the prompt size bounded on long calls (predictable LLM latency, fewer tokens)
+    How: One call to the small SUMMARY_LLM_MODEL, last CONVERSATION_RECENT_TURNS exchanges stay verbatim
+    Note: Runs off the request path; turns added while it runs are kept
+    """
+    history = conversations.get(call_sid)
+    keep = CONVERSATION_RECENT_TURNS * 2
+    older = history["recent"][:-keep] if history else []
+    if not older:
+        return
+    
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in older)
+    if history["summary"]:
+        transcript = f"Earlier summary: {history['summary']}\n{transcript}"
+    
+    start_time = datetime.now()
+    try:
+        summary = await get_llm_response(
+            [SUMMARY_MESSAGE, {"role": "user", "content": transcript}],
+            model=SUMMARY_LLM_MODEL,
+            call_sid=call_sid
+        )
+    except Exception as e:
+        log.error(f"❌ Conversation summary failed: {str(e)}")
+        json_logger.log_event(
+            event_type="llm",
+            call_sid=call_sid,
+            step="summary_error",
+            data={"error": str(e), "model": SUMMARY_LLM_MODEL},
+            duration=(datetime.now() - start_time).total_seconds()
+        )
+        return
+    
+    current = conversations.get(call_sid)
+    if current is None:
+        return  # call ended meanwhile
+    # Drop exactly the summarized messages - the hard window may have trimmed some meanwhile
+    summarized = {id(m) for m in older}
+    current["summary"] = summary
+    current["recent"] = [m for m in current["recent"] if id(m) not in summarized]
+    
+    json_logger.log_event(
+        event_type="llm",
+        call_sid=call_sid,
+        step="conversation_summarized",
+        data={
+            "model": SUMMARY_LLM_MODEL,
+            "summarized_messages": len(older),
+            "summary_length": len(summary)
+        },
+        duration=(datetime.now() - start_time).total_seconds()
+    )
+
+
+def generate_tts_audio(text):
+    """
+    Helper: Generate TTS audio
+    
+    Purpose: Converts text to speech audio for voice responses
+    Why: Twilio's <Play> accepts MP3, so gTTS output is served as-is - no transcoding step
+    Returns: MP3 bytes or None on error
+    Note: Blocking (gTTS makes an HTTPS call) - run it via asyncio.to_thread
+    """
+    try:
+        tts = gTTS(text=text, lang=TTS_LANG, slow=False)
+        mp3_buffer = BytesIO()
+        tts.write_to_fp(mp3_buffer)
+        return mp3_buffer.getvalue()
     except Exception as e:
         log.error(f"TTS Error: {str(e)}")
-        return None, None
+        return None
+
+
+def _tts_digest(text):
+    return hashlib.blake2b(f"{text}|{TTS_LANG}".encode(), digest_size=16).hexdigest()
+
+
+def clip_filename(text, call_sid):
+    """Helper: Deterministic audio filename of text's clip on this call - known before synthesis ends"""
+    return f"tts_{call_sid}_{_tts_digest(text)[:16]}.mp3"
+
+
+async def synthesize_clip(text, call_sid):
+    """
+    Helper: Get a playable audio clip for text, generating it if needed
+    
+    Purpose: Produces the filename Twilio fetches from /api/voice/audio/
+    Why: Keeps clips in memory (no disk writes/reads); the same text is only sent to gTTS
+    once per TTS_CACHE_TTL, across all calls (tts_cache), and each call gets its own filename for it
+    Returns: audio filename or None if TTS failed
+    """
+    digest = _tts_digest(text)
+    filename = clip_filename(text, call_sid)
+    data = audio_store.get(filename) or tts_cache.get(digest)
+    if data is None:
+        data = await asyncio.to_thread(generate_tts_audio, text)
+        if data is None:
+            return None
+        tts_cache[digest] = data
+    audio_store[filename] = data  # (re)insert - starts a fresh TTL; bytes are shared, not copied
+    return filename
+
+
+def start_clip(text, call_sid):
+    """
+    Helper: Run synthesize_clip in the background, registered under its filename
+    
+    Why: The TwiML can list a clip before its audio exists - serve_audio waits on the task
+    in _clip_tasks when Twilio fetches it early. The same text on a call shares one task
+    Returns: the asyncio task (result: filename or None)
+    """
+    filename = clip_filename(text, call_sid)
+    task = _clip_tasks.get(filename)
+    if task is None:
+        task = asyncio.create_task(synthesize_clip(text, call_sid))
+        _clip_tasks[filename] = task
+        task.add_done_callback(lambda _: _clip_tasks.pop(filename, None))
+    return task
+
+
+def cancel_tts_tasks(tasks):
+    """
+    Helper: Cancel the synthesize_clip tasks of an answer that is being thrown away
+    
+    Why: Without it they keep running unreferenced and cache clips nobody will play.
+    A gTTS request already inside its worker thread still finishes, but its clip is never stored
+    """
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+
+
+@lru_cache(maxsize=32)
+def get_twilio_client(account_sid, auth_token):
+    """
+    Helper: Shared Twilio REST client per credential set
+    
+    Purpose: Reuse one TwilioClient (and its HTTP session) instead of building one per request
+    Returns: TwilioClient for the given account
+    """
+    return TwilioClient(account_sid, auth_token)
+
+
+async def prepare_canned_audio():
+    """
+    Startup task: Synthesize the fixed CANNED_PHRASES prompts once
+    
+    Purpose: Greeting/retry prompts become a static file play instead of Twilio TTS on every call
+    Why: Saves Twilio synthesis latency and keeps the same voice as the AI responses
+    """
+    keys = list(CANNED_PHRASES)
+    clips = await asyncio.gather(
+        *(asyncio.to_thread(generate_tts_audio, CANNED_PHRASES[key]) for key in keys)
+    )
+    for key, data in zip(keys, clips):
+        if data:
+            filename = f"canned_{key}.mp3"
+            pinned_audio[filename] = data
+            CANNED_AUDIO[key] = filename
+        else:
+            log.warning(f"⚠️  Could not pre-generate '{key}' prompt, using Twilio TTS for it")
+    log.info(f"🔊 Canned prompts ready: {len(CANNED_AUDIO)}/{len(keys)}")
+
+
+def add_canned_prompt(response, key, base_url):
+    """Helper: Play a pre-generated CANNED_PHRASES prompt, or <Say> it if its audio isn't available"""
+    filename = CANNED_AUDIO.get(key)
+    if filename:
+        response.play(f"{base_url}/api/voice/audio/{filename}")
+    else:
+        response.say(CANNED_PHRASES[key], voice="alice")
+
+
+@lru_cache(maxsize=64)
+def _prompt_template(key, base_url, audio_filename):
+    """
+    Helper: Serialized TwiML for a canned prompt followed by a speech <Gather>
+    
+    Purpose: Built once per (prompt, host, clip) instead of running the TwiML builder on every call
+    Why: The body is static apart from the call SID, left as the __SID__ placeholder
+    Returns: TwiML XML string
+    """
+    response = VoiceResponse()
+    add_canned_prompt(response, key, base_url)
+    response.append(Gather(
+        input="speech",
+        action="/api/voice/process?call_sid=__SID__",
+        method="POST",
+        speech_timeout="auto"
+    ))
+    return str(response)
+
+
+def prompt_twiml(key, base_url, call_sid):
+    """Helper: TwiML that plays a CANNED_PHRASES prompt and listens for speech on this call"""
+    # audio_filename is part of the cache key so templates built before the clips were ready get replaced
+    template = _prompt_template(key, base_url, CANNED_AUDIO.get(key))
+    return template.replace("__SID__", escape(call_sid, {'"': "&quot;"}))
 
 
 def validate_twilio_credentials(account_sid, auth_token, phone_number):
@@ -243,6 +831,7 @@ async def root():
             "voice_incoming": "POST /api/voice/incoming",
             "voice_process": "POST /api/voice/process",
             "voice_audio": "GET /api/voice/audio/{filename}",
+            "voice_status": "POST /api/voice/status",
             "chat": "GET/POST /api/chat",
             "status": "GET /api/status",
             "twilio_credentials": "GET/POST /api/twilio/credentials"
@@ -282,7 +871,7 @@ async def status():
 
 
 @app.post("/api/voice/incoming")
-async def incoming_call(CallSid: str = Form(...), From: str = Form(...)):
+async def incoming_call(request: Request, CallSid: str = Form(...), From: str = Form(...)):
     """
     Incoming call handler - First endpoint called when Twilio receives a call
     
@@ -305,21 +894,11 @@ async def incoming_call(CallSid: str = Form(...), From: str = Form(...)):
     log.info(f"📞 INCOMING CALL - SID: {CallSid}, From: {From}")
     
     # Initialize conversation
-    conversations[CallSid] = [
-        {"role": "system", "content": SYSTEM_PROMPT}
-    ]
+    conversations[CallSid] = new_conversation()
     print(f"✅ Conversation initialized for Call SID: {CallSid}")
     
-    # Create TwiML response
-    response = VoiceResponse()
-    response.say("Hello! Please speak.", voice="alice")
-    gather = Gather(
-        input="speech",
-        action=f"/api/voice/process?call_sid={CallSid}",
-        method="POST",
-        speech_timeout="auto"
-    )
-    response.append(gather)
+    # TwiML response from the cached template
+    twiml = prompt_twiml("greet", str(request.base_url).rstrip("/"), CallSid)
     
     json_logger.log_event(
         event_type="call_incoming",
@@ -331,7 +910,7 @@ async def incoming_call(CallSid: str = Form(...), From: str = Form(...)):
     print(f"✅ TwiML response created, waiting for speech...")
     print("=" * 60 + "\n")
     
-    return Response(content=str(response), media_type="application/xml")
+    return Response(content=twiml, media_type="application/xml")
 
 
 @app.post("/api/voice/process")
@@ -350,28 +929,26 @@ async def process_speech(
     
     Processing Pipeline (4 steps):
     1. STT (Speech-to-Text): Already done by Twilio, we receive the text
-    2. LLM: Send text to Groq AI to get intelligent response
-    3. TTS (Text-to-Speech): Convert AI response to audio using Google TTS
-    4. Response: Send audio back to Twilio to play to caller
+    2. LLM: Send text to Groq AI to get intelligent response (streamed sentence by sentence)
+    3. TTS (Text-to-Speech): Convert each sentence to audio using Google TTS as soon as it arrives
+    4. Response: Send the audio clips back to Twilio to play to caller in order - as soon as the
+       first clip is ready; later ones may still be synthesizing (serve_audio waits for them)
     
     Why this design:
     - Separates concerns: each step is logged and can be debugged independently
     - Maintains conversation history per call (using call_sid)
     - Falls back to Twilio TTS if our TTS fails
-    - Keeps last 10 messages for context (CONVERSATION_HISTORY_LIMIT)
+    - Keeps recent turns verbatim and summarizes older ones (CONVERSATION_TOKEN_LIMIT)
     """
     process_start_time = datetime.now()
     
-    print("\n" + "=" * 60)
-    print(f"🔄 PROCESSING SPEECH REQUEST")
-    print(f"   Call SID: {call_sid}")
-    print(f"   Speech Result Length: {len(SpeechResult) if SpeechResult else 0}")
-    print("=" * 60)
-    
-    log.info("=" * 60)
-    log.info(f"🔄 PROCESSING SPEECH REQUEST")
-    log.info(f"   Call SID: {call_sid}")
-    log.info(f"   Speech Result Length: {len(SpeechResult) if SpeechResult else 0}")
+    if VERBOSE_VOICE_LOGS:
+        print("\n" + "=" * 60)
+        print(f"🔄 PROCESSING SPEECH REQUEST")
+        print(f"   Call SID: {call_sid}")
+        print(f"   Speech Result Length: {len(SpeechResult) if SpeechResult else 0}")
+        print("=" * 60)
+    log.debug("🔄 speech request sid=%s speech_len=%d", call_sid, len(SpeechResult) if SpeechResult else 0)
     
     json_logger.log_event(
         event_type="speech_processing",
@@ -386,7 +963,7 @@ async def process_speech(
     
     # Validate speech input - Handle silence / no speech
     if not SpeechResult or len(SpeechResult.strip()) < 2:
-        log.warning("⚠️  No speech detected or speech too short")
+        log.warning("⚠️  No speech detected or speech too short (sid=%s)", call_sid)
         json_logger.log_event(
             event_type="speech_processing",
             call_sid=call_sid,
@@ -399,25 +976,12 @@ async def process_speech(
             duration=(datetime.now() - process_start_time).total_seconds()
         )
         
-        response = VoiceResponse()
-        response.say("I didn't hear anything. Please speak again.", voice="alice")
-        gather = Gather(
-            input="speech",
-            action=f"/api/voice/process?call_sid={call_sid}",
-            method="POST",
-            speech_timeout="auto"
-        )
-        response.append(gather)
-        log.info("=" * 60)
-        return Response(content=str(response), media_type="application/xml")
+        twiml = prompt_twiml("no_speech", str(request.base_url).rstrip("/"), call_sid)
+        return Response(content=twiml, media_type="application/xml")
     
     # Handle STT failure (empty or invalid transcription)
     if SpeechResult.strip().lower() in ["", "error", "failed", "timeout"]:
-        print(f"⚠️  STT failure detected")
-        print(f"   Speech Result: '{SpeechResult}'")
-        print("=" * 60 + "\n")
-        
-        log.warning("⚠️  STT failure detected")
+        log.warning("⚠️  STT failure detected (sid=%s): %r", call_sid, SpeechResult)
         json_logger.log_event(
             event_type="stt",
             call_sid=call_sid,
@@ -430,38 +994,23 @@ async def process_speech(
             duration=(datetime.now() - process_start_time).total_seconds()
         )
         
-        response = VoiceResponse()
-        response.say("I'm having trouble understanding. Please try again.", voice="alice")
-        gather = Gather(
-            input="speech",
-            action=f"/api/voice/process?call_sid={call_sid}",
-            method="POST",
-            speech_timeout="auto"
-        )
-        response.append(gather)
-        log.info("=" * 60)
-        return Response(content=str(response), media_type="application/xml")
+        twiml = prompt_twiml("stt_failure", str(request.base_url).rstrip("/"), call_sid)
+        return Response(content=twiml, media_type="application/xml")
     
     user_text = SpeechResult.strip()
-    turn_num = len(conversations.get(call_sid, [])) - 1
-    
-    # STEP 1: Speech-to-Text (already done by Twilio)
-    stt_start = datetime.now()
-    print(f"\n📝 STEP 1: SPEECH-TO-TEXT (STT)")
-    print(f"   Source: Twilio Speech Recognition")
-    print(f"   Note: Twilio handles STT internally, no raw audio file received")
-    print(f"   Transcribed Text: \"{user_text}\"")
-    print(f"   Text Length: {len(user_text)} characters")
-    print(f"   Turn Number: {turn_num}")
-    
-    log.info(f"📝 STEP 1: SPEECH-TO-TEXT (STT)")
-    log.info(f"   Source: Twilio Speech Recognition")
-    log.info(f"   Note: Twilio handles STT internally, no raw audio file received")
-    log.info(f"   Transcribed Text: \"{user_text}\"")
-    log.info(f"   Text Length: {len(user_text)} characters")
-    log.info(f"   Turn Number: {turn_num}")
-    
-    stt_duration = (datetime.now() - stt_start).total_seconds()
+    history = conversations.get(call_sid) or new_conversation()
+    turn_num = history["turns"]
+    
+    # STEP 1: Speech-to-Text (already done by Twilio - nothing to time here)
+    if VERBOSE_VOICE_LOGS:
+        print(f"\n📝 STEP 1: SPEECH-TO-TEXT (STT)")
+        print(f"   Source: Twilio Speech Recognition")
+        print(f"   Note: Twilio handles STT internally, no raw audio file received")
+        print(f"   Transcribed Text: \"{user_text}\"")
+        print(f"   Text Length: {len(user_text)} characters")
+        print(f"   Turn Number: {turn_num}")
+    log.debug("📝 stt turn=%d sid=%s text_len=%d", turn_num, call_sid, len(user_text))
+    
     json_logger.log_event(
         event_type="stt",
         call_sid=call_sid,
@@ -472,36 +1021,59 @@ async def process_speech(
             "text_length": len(user_text),
             "turn_number": turn_num,
             "note": "Twilio handles STT internally, no raw audio file available"
-        },
-        duration=stt_duration
+        }
     )
     
     # STEP 2: LLM Processing
-    print(f"\n🤖 STEP 2: LLM PROCESSING")
-    print(f"   Model: {GROQ_LLM_MODEL}")
-    print(f"   Sending to LLM...")
+    if VERBOSE_VOICE_LOGS:
+        print(f"\n🤖 STEP 2: LLM PROCESSING")
+        print(f"   Model: {GROQ_LLM_MODEL}")
+        print(f"   Sending to LLM...")
     
-    log.info(f"🤖 STEP 2: LLM PROCESSING")
-    log.info(f"   Model: {GROQ_LLM_MODEL}")
+    messages = build_llm_messages(history, user_text)
     
-    messages = conversations.get(call_sid, []) + [{"role": "user", "content": user_text}]
+    # Semantic cache - only for a call's opening turn: later answers depend on this caller's
+    # whole history/summary, so reusing them could leak one caller's details to another
+    cache_embedding = None
+    if not history["summary"] and not history["recent"]:
+        cache_embedding = await voice_semantic_cache.embed(user_text)
+    cached = voice_semantic_cache.lookup(cache_embedding)
+    llm_succeeded = False
+    
+    # One TTS task per streamed sentence, so synthesis overlaps LLM generation
+    sentences = []
+    tts_tasks = []
     
     llm_start = datetime.now()
     try:
-        ai_response = get_llm_response(messages)
+        if cached:
+            ai_response = cached["response"]
+            # Re-synthesized per sentence below - those clips are normally still in tts_cache
+            sentences = list(cached["sentences"] or [])
+            tts_tasks = [start_clip(sentence, call_sid) for sentence in sentences]
+            log.debug("⚡ semantic cache hit sid=%s similarity=%.3f", call_sid, cached["similarity"])
+        else:
+            async for sentence in stream_llm_sentences(messages, call_sid=call_sid):
+                sentences.append(sentence)
+                tts_tasks.append(start_clip(sentence, call_sid))
+            ai_response = " ".join(sentences)
+        llm_succeeded = True
         llm_duration = (datetime.now() - llm_start).total_seconds()
         
         # Update conversation history
-        messages.append({"role": "assistant", "content": ai_response})
-        conversations[call_sid] = messages[-CONVERSATION_HISTORY_LIMIT:]
-        
-        print(f"✅ LLM Response received")
-        print(f"   Response: \"{ai_response[:100]}{'...' if len(ai_response) > 100 else ''}\"")
-        print(f"   Processing Time: {llm_duration:.2f} seconds")
+        history["recent"] = (history["recent"] + [
+            {"role": "user", "content": user_text},
+            {"role": "assistant", "content": ai_response}
+        ])[-CONVERSATION_MAX_RECENT_MESSAGES:]
+        history["turns"] += 1
+        conversations[call_sid] = history
+        schedule_conversation_compaction(call_sid)
         
-        log.info(f"✅ LLM Response received")
-        log.info(f"   Response: \"{ai_response[:100]}{'...' if len(ai_response) > 100 else ''}\"")
-        log.info(f"   Processing Time: {llm_duration:.2f} seconds")
+        if VERBOSE_VOICE_LOGS:
+            print(f"✅ LLM Response received")
+            print(f"   Response: \"{ai_response[:100]}{'...' if len(ai_response) > 100 else ''}\"")
+            print(f"   Processing Time: {llm_duration:.2f} seconds")
+        log.debug("🤖 llm turn=%d sid=%s response_len=%d llm_s=%.2f", turn_num, call_sid, len(ai_response), llm_duration)
         
         # Log LLM response
         json_logger.log_event(
@@ -512,15 +1084,19 @@ async def process_speech(
                 "model": GROQ_LLM_MODEL,
                 "model_response_text": ai_response,
                 "response_length": len(ai_response),
-                "turn_number": turn_num
+                "sentence_count": len(sentences),
+                "turn_number": turn_num,
+                "semantic_cache_hit": bool(cached),
+                "semantic_cache_similarity": cached["similarity"] if cached else None
             },
             duration=llm_duration
         )
         
     except TimeoutError as e:
         ai_response = "I apologize, but the request timed out. Please try again."
-        print(f"❌ LLM TIMEOUT: {str(e)}")
-        log.error(f"❌ LLM TIMEOUT: {str(e)}")
+        cancel_tts_tasks(tts_tasks)
+        sentences, tts_tasks = [], []  # drop audio for any partially streamed answer
+        log.error("❌ LLM TIMEOUT (sid=%s): %s", call_sid, e)
         json_logger.log_event(
             event_type="llm",
             call_sid=call_sid,
@@ -534,9 +1110,9 @@ async def process_speech(
         )
     except Exception as e:
         ai_response = f"I apologize, but I encountered an error: {str(e)}"
-        print(f"❌ LLM ERROR: {str(e)}")
-        print(f"   Error Type: {type(e).__name__}")
-        log.error(f"❌ LLM ERROR: {str(e)}")
+        cancel_tts_tasks(tts_tasks)
+        sentences, tts_tasks = [], []  # drop audio for any partially streamed answer
+        log.error("❌ LLM ERROR (sid=%s, %s): %s", call_sid, type(e).__name__, e)
         json_logger.log_event(
             event_type="llm",
             call_sid=call_sid,
@@ -550,32 +1126,49 @@ async def process_speech(
         )
     
     # STEP 3: Text-to-Speech
-    print(f"\n🔊 STEP 3: TEXT-TO-SPEECH (TTS)")
-    print(f"   Provider: Google TTS (gTTS)")
-    print(f"   Generating audio...")
-    
-    log.info(f"🔊 STEP 3: TEXT-TO-SPEECH (TTS)")
-    log.info(f"   Provider: Google TTS (gTTS)")
+    if VERBOSE_VOICE_LOGS:
+        print(f"\n🔊 STEP 3: TEXT-TO-SPEECH (TTS)")
+        print(f"   Provider: Google TTS (gTTS)")
+        print(f"   Generating audio...")
     
     tts_start = datetime.now()
-    wav_path, mp3_path = generate_tts_audio(ai_response, call_sid)
+    
+    # Prepare the parts of the reply that don't depend on the audio while TTS threads are still running
+    base_url = str(request.base_url).rstrip("/")
+    gather = Gather(
+        input="speech",
+        action=f"/api/voice/process?call_sid={call_sid}",
+        method="POST",
+        speech_timeout="auto"
+    )
+    
+    if not tts_tasks:
+        # LLM error message (or a cache entry without sentences) - synthesize it in one piece
+        sentences = [ai_response]
+        tts_tasks = [start_clip(ai_response, call_sid)]
+    # Only the first clip is awaited: once it exists gTTS is known to work, and the later
+    # clips keep synthesizing while Twilio plays it (serve_audio waits for any that are
+    # fetched early). If the first one fails, wait for all so failures can fall back to <Say>
+    if await tts_tasks[0]:
+        segments = [(sentence, clip_filename(sentence, call_sid)) for sentence in sentences]
+    else:
+        segments = list(zip(sentences, await asyncio.gather(*tts_tasks)))
+    pending_clips = sum(not task.done() for task in tts_tasks)
     tts_duration = (datetime.now() - tts_start).total_seconds()
     
-    audio_url = None
-    tts_filename = None
-    if wav_path:
-        tts_filename = os.path.basename(wav_path)
-        base_url = str(request.base_url).rstrip("/")
-        audio_url = f"{base_url}/api/voice/audio/{tts_filename}"
-        print(f"✅ TTS Audio generated successfully")
-        print(f"   TTS Filename: {tts_filename}")
-        print(f"   Audio URL: {audio_url}")
-        print(f"   TTS Time: {tts_duration:.2f} seconds")
-        
-        log.info(f"✅ TTS Audio generated successfully")
-        log.info(f"   TTS Filename: {tts_filename}")
-        log.info(f"   Audio URL: {audio_url}")
-        log.info(f"   TTS Time: {tts_duration:.2f} seconds")
+    tts_filenames = [name for _, name in segments if name]
+    tts_complete = len(tts_filenames) == len(segments)
+    if llm_succeeded and not cached:
+        # Sentences, not filenames: per-call clips expire from audio_store long before tts_cache
+        voice_semantic_cache.add(cache_embedding, ai_response, sentences)
+    
+    audio_urls = [f"{base_url}/api/voice/audio/{name}" for name in tts_filenames]
+    if tts_complete:
+        if VERBOSE_VOICE_LOGS:
+            print(f"✅ TTS Audio generated successfully")
+            print(f"   TTS Files: {', '.join(tts_filenames)}")
+            print(f"   TTS Time (after LLM): {tts_duration:.2f} seconds")
+        log.debug("🔊 tts turn=%d sid=%s clips=%d tts_s=%.2f", turn_num, call_sid, len(tts_filenames), tts_duration)
         
         json_logger.log_event(
             event_type="tts",
@@ -583,16 +1176,21 @@ async def process_speech(
             step="text_to_speech",
             data={
                 "provider": "gtts",
-                "tts_filename": tts_filename,
-                "audio_url": audio_url,
+                "tts_filenames": tts_filenames,
+                "audio_urls": audio_urls,
+                "segment_count": len(segments),
+                "pending_segments": pending_clips,
+                "semantic_cache_hit": bool(cached),
                 "text_length": len(ai_response),
                 "turn_number": turn_num
             },
             duration=tts_duration
         )
     else:
-        print(f"⚠️  TTS failed, falling back to Twilio TTS")
-        log.warning("⚠️  TTS failed, falling back to Twilio TTS")
+        log.warning(
+            "⚠️  TTS failed for %d segment(s), falling back to Twilio TTS (sid=%s)",
+            len(segments) - len(tts_filenames), call_sid
+        )
         json_logger.log_event(
             event_type="tts",
             call_sid=call_sid,
@@ -601,32 +1199,22 @@ async def process_speech(
                 "error": "TTS generation failed",
                 "error_type": "tts_failure",
                 "fallback": "twilio_tts",
+                "failed_segments": len(segments) - len(tts_filenames),
+                "segment_count": len(segments),
                 "turn_number": turn_num
             },
             duration=tts_duration
         )
     
     # STEP 4: Send Response
-    print(f"\n📤 STEP 4: SENDING RESPONSE")
-    log.info(f"📤 STEP 4: SENDING RESPONSE")
-    
+    # Twilio plays the segments back to back, in order
     response = VoiceResponse()
+    for text, name in segments:
+        if name:
+            response.play(f"{base_url}/api/voice/audio/{name}")
+        else:
+            response.say(text, voice="alice")
     
-    if audio_url:
-        response.play(audio_url)
-        print(f"   Using generated audio file: {tts_filename}")
-        log.info(f"   Using generated audio file")
-    else:
-        response.say(ai_response, voice="alice")
-        print(f"   Using Twilio text-to-speech fallback")
-        log.info(f"   Using Twilio text-to-speech fallback")
-    
-    gather = Gather(
-        input="speech",
-        action=f"/api/voice/process?call_sid={call_sid}",
-        method="POST",
-        speech_timeout="auto"
-    )
     response.append(gather)
     response.hangup()
     
@@ -640,68 +1228,112 @@ async def process_speech(
         duration=total_duration
     )
     
-    print(f"\n✅ Response sent to Twilio")
-    print(f"   Total Processing Time: {total_duration:.2f} seconds")
-    print("=" * 60 + "\n")
-    
-    log.info(f"✅ Response sent to Twilio")
-    log.info(f"   Total Processing Time: {total_duration:.2f} seconds")
-    log.info("=" * 60)
+    if VERBOSE_VOICE_LOGS:
+        print(f"\n📤 STEP 4: SENDING RESPONSE")
+        print(f"   Playing {len(tts_filenames)} generated audio file(s), {len(segments) - len(tts_filenames)} Twilio TTS fallback(s)")
+        print(f"\n✅ Response sent to Twilio")
+        print(f"   Total Processing Time: {total_duration:.2f} seconds")
+        print("=" * 60 + "\n")
+    log.info("✅ turn=%d sid=%s clips=%d total_s=%.2f", turn_num, call_sid, len(tts_filenames), total_duration)
     
     return Response(content=str(response), media_type="application/xml")
 
 
+@app.post("/api/voice/status")
+async def call_status(CallSid: str = Form(...), CallStatus: str = Form("")):
+    """
+    Call status callback - Twilio reports call state changes here
+    
+    Purpose: Frees the conversation history as soon as a call ends
+    When called: By Twilio, if "Call status changes" is pointed at this URL
+    Returns: Empty 204 response
+    Use case: Without it, ended calls only leave memory when their conversation TTL expires
+    """
+    if CallStatus in CALL_ENDED_STATUSES:
+        conversations.pop(CallSid, None)
+        json_logger.log_event(
+            event_type="call_status",
+            call_sid=CallSid,
+            step="call_ended",
+            data={"call_status": CallStatus}
+        )
+    return Response(status_code=204)
+
+
 @app.get("/api/voice/audio/{filename}")
 async def serve_audio(filename: str):
     """
-    Audio file server - Serves generated TTS audio files
+    Audio server - Serves generated TTS audio clips
     
-    Purpose: Provides HTTP access to generated audio files for Twilio to play
-    When called: By Twilio when it needs to play the audio file we generated
-    Returns: WAV audio file or 404 if file doesn't exist
-    Use case: Twilio can't access local files, so we serve them via HTTP
+    Purpose: Provides HTTP access to generated audio clips for Twilio to play
+    When called: By Twilio when it needs to play the audio we generated
+    Returns: MP3 audio or 404 if the clip doesn't exist (or was evicted, or its TTS failed)
+    Use case: Twilio needs a public URL to fetch and play the audio
     
     Why needed:
-    - We generate audio files locally (in audio_files/output/)
+    - We generate audio clips in memory (audio_store / pinned_audio)
     - Twilio needs a public URL to fetch and play the audio
-    - This endpoint makes our local files accessible via HTTP
+    - This endpoint serves the clip bytes straight from memory, no disk I/O
     - Used in the response.play() call in process_speech endpoint
+    - TwiML is sent before every clip is synthesized, so a clip may still be in progress -
+      then this waits for its task (asyncio.wait: a dropped request doesn't cancel the synthesis)
     """
-    audio_path = f"{AUDIO_DIR}/output/{filename}"
-    if os.path.exists(audio_path):
-        return FileResponse(audio_path, media_type="audio/wav")
-    return Response(status_code=404)
+    data = pinned_audio.get(filename) or audio_store.get(filename)
+    if data is None and filename in _clip_tasks:
+        await asyncio.wait([_clip_tasks[filename]])
+        data = audio_store.get(filename)
+        if data is None:
+            log.warning("⚠️  Clip %s failed to synthesize, Twilio will skip it", filename)
+    if data is None:
+        return Response(status_code=404)
+    return Response(content=data, media_type="audio/mpeg")
 
 
-@app.post("/api/chat")
-async def chat_endpoint(message: str = Form(...)):
+async def _do_chat(message, method, use_cache=False):
     """
-    Chat endpoint (POST) - Text-based chat interface for frontend
-    
-    Purpose: Allows frontend to send text messages and get AI responses
-    When called: When user types a message in the web UI and submits
-    Returns: AI response as JSON with status, input, response, and model info
-    Use case: Web-based chat interface (separate from voice calls)
+    Shared chat pipeline behind POST and GET /api/chat
     
-    Why separate from voice:
-    - Voice uses Twilio webhooks (Form data from Twilio)
-    - Chat uses standard POST requests from frontend
-    - Different use cases: voice calls vs text chat
-    - Same LLM backend, different input/output methods
+    Purpose: One implementation of the text chat flow (cache lookup, LLM, logging)
+    Args: method is "POST" or "GET" - only used for logs (GET steps get a "_get" suffix)
+          use_cache (?cache=1) enables answer reuse: the exact-match llm_response_cache first,
+          then chat_semantic_cache. Without it every message goes to the LLM (temperature=1)
+    Returns: Response dict for the endpoint
     """
+    step_suffix = "_get" if method == "GET" else ""
     start_time = datetime.now()
     log.info("=" * 60)
-    log.info(f"💬 CHAT ENDPOINT (POST)")
+    log.info(f"💬 CHAT ENDPOINT ({method})")
     log.info(f"   Input Message: \"{message}\"")
     log.info(f"   Model: {GROQ_LLM_MODEL}")
     
     try:
         messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": message}
         ]
         
-        ai_response = get_llm_response(messages)
+        cache_hit = None  # "exact" / "semantic" when the answer was reused
+        cache_key = None
+        cache_embedding = None
+        ai_response = None
+        if use_cache:
+            # Exact repeats first - otherwise the semantic cache (cosine 1.0) would always answer them
+            cache_key = llm_cache_key(messages, GROQ_LLM_MODEL)
+            ai_response = llm_response_cache.get(cache_key)
+            if ai_response is not None:
+                cache_hit = "exact"
+            else:
+                cache_embedding = await chat_semantic_cache.embed(message)
+                cached = chat_semantic_cache.lookup(cache_embedding)
+                if cached:
+                    ai_response = cached["response"]
+                    cache_hit = "semantic"
+                    log.info(f"⚡ Semantic cache hit (similarity {cached['similarity']:.3f}), skipping LLM")
+        if ai_response is None:
+            ai_response = await get_llm_response(messages)
+            if cache_key is not None:
+                llm_response_cache[cache_key] = ai_response
+            chat_semantic_cache.add(cache_embedding, ai_response)  # no-op without use_cache
         duration = (datetime.now() - start_time).total_seconds()
         
         log.info(f"✅ LLM Response received")
@@ -711,12 +1343,14 @@ async def chat_endpoint(message: str = Form(...)):
         
         json_logger.log_event(
             event_type="chat",
-            step="llm_response",
+            step=f"llm_response{step_suffix}",
             data={
                 "model": GROQ_LLM_MODEL,
                 "input": message,
                 "response": ai_response,
-                "response_length": len(ai_response)
+                "response_length": len(ai_response),
+                "cache_hit": cache_hit,
+                "semantic_cache_hit": cache_hit == "semantic"
             },
             duration=duration
         )
@@ -735,7 +1369,7 @@ async def chat_endpoint(message: str = Form(...)):
         
         json_logger.log_event(
             event_type="chat",
-            step="llm_error",
+            step=f"llm_error{step_suffix}",
             data={"error": str(e), "input": message},
             duration=duration
         )
@@ -746,8 +1380,27 @@ async def chat_endpoint(message: str = Form(...)):
         }
 
 
+@app.post("/api/chat")
+async def chat_endpoint(message: str = Form(...), cache: bool = Query(False)):
+    """
+    Chat endpoint (POST) - Text-based chat interface for frontend
+    
+    Purpose: Allows frontend to send text messages and get AI responses
+    When called: When user types a message in the web UI and submits
+    Returns: AI response as JSON with status, input, response, and model info
+    Use case: Web-based chat interface (separate from voice calls)
+    
+    Why separate from voice:
+    - Voice uses Twilio webhooks (Form data from Twilio)
+    - Chat uses standard POST requests from frontend
+    - Different use cases: voice calls vs text chat
+    - Same LLM backend, different input/output methods
+    """
+    return await _do_chat(message, "POST", use_cache=cache)
+
+
 @app.get("/api/chat")
-async def chat_endpoint_get(message: str = Query(...)):
+async def chat_endpoint_get(message: str = Query(...), cache: bool = Query(False)):
     """
     Chat endpoint (GET) - Alternative text chat using GET method
     
@@ -758,65 +1411,11 @@ async def chat_endpoint_get(message: str = Query(...)):
     
     Why both GET and POST:
     - Some clients prefer GET for simplicity
-    - GET is easier to test in browser (just add ?message=hello)
+    - GET is easier to test in browser (just add ?message=hello, and &cache=1 to reuse answers)
     - POST is more standard for form submissions
-    - Both use the same LLM processing logic
+    - Both use the same LLM processing logic (_do_chat)
     """
-    start_time = datetime.now()
-    log.info("=" * 60)
-    log.info(f"💬 CHAT ENDPOINT (GET)")
-    log.info(f"   Input Message: \"{message}\"")
-    log.info(f"   Model: {GROQ_LLM_MODEL}")
-    
-    try:
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": message}
-        ]
-        
-        ai_response = get_llm_response(messages)
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        log.info(f"✅ LLM Response received")
-        log.info(f"   Response Length: {len(ai_response)} characters")
-        log.info(f"   Processing Time: {duration:.2f} seconds")
-        log.info("=" * 60)
-        
-        json_logger.log_event(
-            event_type="chat",
-            step="llm_response_get",
-            data={
-                "model": GROQ_LLM_MODEL,
-                "input": message,
-                "response": ai_response,
-                "response_length": len(ai_response)
-            },
-            duration=duration
-        )
-        
-        return {
-            "status": "success",
-            "input": message,
-            "response": ai_response,
-            "model": GROQ_LLM_MODEL
-        }
-        
-    except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
-        log.error(f"❌ LLM ERROR: {str(e)}")
-        log.info("=" * 60)
-        
-        json_logger.log_event(
-            event_type="chat",
-            step="llm_error_get",
-            data={"error": str(e), "input": message},
-            duration=duration
-        )
-        
-        return {
-            "status": "error",
-            "error": str(e)
-        }
+    return await _do_chat(message, "GET", use_cache=cache)
 
 
 @app.post("/api/twilio/credentials")
@@ -860,33 +1459,56 @@ async def set_twilio_credentials(
         # Test credentials with Twilio API
         log.info(f"   Testing credentials with Twilio API...")
         try:
-            test_client = TwilioClient(account_sid, auth_token)
-            account = test_client.api.accounts(account_sid).fetch()
-            
-            if not account:
-                return {
-                    "status": "error",
-                    "error": "Failed to validate credentials with Twilio"
-                }
-            
-            log.info(f"✅ Twilio credentials validated successfully")
-            log.info(f"   Account Name: {account.friendly_name}")
-            
-            # Verify phone number belongs to this account
-            try:
-                incoming_numbers = test_client.incoming_phone_numbers.list(
-                    phone_number=phone_number,
-                    limit=1
+            # JSON-encoded before hashing so each field stays delimited - plain concatenation would
+            # let characters shift between SID and token and collide with a validated pair
+            cache_key = hashlib.sha256(orjson.dumps([account_sid, auth_token, phone_number])).hexdigest()
+            account_name = _twilio_validations.get(cache_key)
+            if account_name is not None:
+                log.info(f"✅ Twilio credentials already validated (cached)")
+            else:
+                test_client = get_twilio_client(account_sid, auth_token)
+                # Twilio SDK is synchronous - run its REST calls off the event loop, concurrently
+                # since the account fetch and the number lookup don't depend on each other
+                account, incoming_numbers = await asyncio.gather(
+                    asyncio.to_thread(test_client.api.accounts(account_sid).fetch),
+                    asyncio.to_thread(
+                        test_client.incoming_phone_numbers.list,
+                        phone_number=phone_number,
+                        limit=1
+                    ),
+                    return_exceptions=True
                 )
-                if not incoming_numbers:
+                
+                # Account check decides the outcome - its errors get the friendly messages below
+                if isinstance(account, Exception):
+                    raise account
+                if not account:
+                    return {
+                        "status": "error",
+                        "error": "Failed to validate credentials with Twilio"
+                    }
+                
+                account_name = account.friendly_name
+                log.info(f"✅ Twilio credentials validated successfully")
+                log.info(f"   Account Name: {account_name}")
+                
+                # Verify phone number belongs to this account
+                phone_verified = False
+                if isinstance(incoming_numbers, Exception):
+                    log.warning(f"⚠️  Could not verify phone number: {str(incoming_numbers)}")
+                elif not incoming_numbers:
                     log.warning(f"⚠️  Phone number {phone_number} not found in account")
                     return {
                         "status": "error",
                         "error": f"Phone number {phone_number} not found in your Twilio account."
                     }
-                log.info(f"✅ Phone number verified: {phone_number}")
-            except Exception as phone_error:
-                log.warning(f"⚠️  Could not verify phone number: {str(phone_error)}")
+                else:
+                    phone_verified = True
+                    log.info(f"✅ Phone number verified: {phone_number}")
+                
+                # Only fully verified credentials are cached
+                if phone_verified:
+                    _twilio_validations[cache_key] = account_name
             
             # Store credentials after validation
             TWILIO_CREDENTIALS["account_sid"] = account_sid
@@ -900,7 +1522,7 @@ async def set_twilio_credentials(
                 data={
                     "account_sid_set": True,
                     "phone_number": phone_number,
-                    "account_name": account.friendly_name
+                    "account_name": account_name
                 }
             )
             
@@ -915,7 +1537,7 @@ async def set_twilio_credentials(
             log.error(f"❌ TWILIO VALIDATION ERROR: {error_msg}")
             
             # User-friendly error messages
-            if "20003" in error_msg or "Authenticate" in error_msg or "Invalid" in error_msg:
+            if any(marker in error_msg for marker in TWILIO_AUTH_ERROR_MARKERS):
                 return {
                     "status": "error",
                     "error": "Invalid Account SID or Auth Token. Please check your credentials."
@@ -990,8 +1612,7 @@ if __name__ == "__main__":
     log.info(f"   Host: {API_HOST}")
     log.info(f"   Port: {API_PORT}")
     log.info(f"   Groq Model: {GROQ_LLM_MODEL}")
-    log.info(f"   Audio Directory: {AUDIO_DIR}")
-    log.info(f"   Log File: logs/app_logs.json")
+    log.info(f"   Log File: {json_logger.log_file}")
     log.info("=" * 60)
     
     json_logger.log_event(
@@ -1000,8 +1621,7 @@ if __name__ == "__main__":
         data={
             "host": API_HOST,
             "port": API_PORT,
-            "model": GROQ_LLM_MODEL,
-            "audio_dir": AUDIO_DIR
+            "model": GROQ_LLM_MODEL
         },
         duration=0
     )
@@ -1012,4 +1632,12 @@ if __name__ == "__main__":
         log.info(f"   (Hugging Face Spaces mode)")
     else:
         log.info(f"   (Local development mode)")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop + httptools (both in requirements.txt) instead of the pure-Python loop/parser;
+    # uvloop has no Windows build. One worker only: conversations and audio live in this process
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools"
+    )